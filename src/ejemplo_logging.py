@@ -14,38 +14,162 @@ Autor: Eduardo Fdez
 Fecha: 2025-10-30
 """
 
+import atexit
+import bisect
+import functools
 import logging
+import os
+import queue
+import re
 import sys
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa el cálculo en Python puro
+    np = None
 
 
 # ==================== CONFIGURACIÓN DEL LOGGING ====================
 
-def configurar_logging(nivel: int = logging.DEBUG, archivo: Optional[str] = None) -> None:
+# Listener activo de la cola de logging (uno como máximo)
+_listener: Optional[QueueListener] = None
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler con buffer de 64 KiB que agrupa las escrituras en disco.
+    
+    En lugar de hacer flush tras cada registro (como FileHandler), solo lo hace
+    cada FLUSH_CADA registros o cuando llega un registro de nivel ERROR o superior.
+    """
+    
+    TAMANO_BUFFER = 65536
+    FLUSH_CADA = 100
+    
+    def __init__(self, filename: str, mode: str = 'w', encoding: Optional[str] = 'utf-8') -> None:
+        self._count = 0
+        super().__init__(filename, mode=mode, encoding=encoding)
+    
+    def _open(self):
+        """Abre el archivo con un buffer grande."""
+        return open(self.baseFilename, self.mode, encoding=self.encoding,
+                    errors=self.errors, buffering=self.TAMANO_BUFFER)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Escribe el registro en el buffer y solo hace flush cuando toca."""
+        # Igual que FileHandler: no reabrir (y truncar) el archivo tras close()
+        if self.stream is None:
+            if self.mode != 'w' or not self._closed:
+                self.stream = self._open()
+        if self.stream is None:
+            return
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+        
+        self._count += 1
+        if self._count >= self.FLUSH_CADA or record.levelno >= logging.ERROR:
+            self.flush()
+            self._count = 0
+
+
+def configurar_logging(nivel: int = logging.DEBUG, archivo: Optional[str] = None,
+                       verbose: bool = False, include_time: bool = True) -> logging.Logger:
     """
     Configura el sistema de logging con formato personalizado.
     
     Args:
         nivel: Nivel mínimo de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         archivo: Si se especifica, guarda los logs en un archivo además de la consola
+        verbose: Si es True, incluye logger, función y línea en cada mensaje
+        include_time: Si es False, los mensajes no llevan fecha y hora
+    
+    Returns:
+        logging.Logger: El logger raíz ya configurado
+    
+    Nota:
+        La consola se escribe de forma síncrona, para que los mensajes salgan en
+        orden con los print() del programa. El archivo se escribe de forma
+        asíncrona: el logger solo encola cada registro y un QueueListener lo
+        escribe en disco en segundo plano.
+        Sin verbose se desactiva la búsqueda de función/línea (recorrido de la
+        pila) y la información de hilos y procesos, que no se muestran.
+        Se puede llamar varias veces: la configuración anterior se cierra
+        antes de crear la nueva.
+        Sin %(asctime)s en el formato, el Formatter no llama a formatTime
+        (ni, por tanto, a time.strftime) para cada registro.
     """
+    global _listener
+    
+    # Detener el listener anterior y cerrar sus handlers (evita fugas de
+    # descriptores de archivo si se reconfigura el logging)
+    if _listener is not None:
+        atexit.unregister(_listener.stop)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    
+    # Información de hilos y procesos: no se usa en ningún formato
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Formato del mensaje de log
-    formato = '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+    if verbose:
+        formato = '%(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
+        if include_time:
+            formato = '%(asctime)s - ' + formato
+        logging._srcfile = os.path.normcase(logging.addLevelName.__code__.co_filename)
+    else:
+        if include_time:
+            formato = '%(asctime)s %(levelname)s %(message)s'
+        else:
+            formato = '%(levelname)s %(name)s %(message)s'
+        # Sin _srcfile, logging no llama a findCaller para cada registro
+        logging._srcfile = None
     formato_fecha = '%Y-%m-%d %H:%M:%S'
     
-    # Configurar handlers
-    handlers = [logging.StreamHandler(sys.stdout)]
+    formatter = logging.Formatter(formato, datefmt=formato_fecha)
     
-    if archivo:
-        handlers.append(logging.FileHandler(archivo, mode='w', encoding='utf-8'))
+    # Configurar handlers: la consola se escribe directamente
+    consola = logging.StreamHandler(sys.stdout)
+    consola.setFormatter(formatter)
+    handlers = [consola]
     
-    # Configuración básica
+    if archivo:
+        archivo_handler = BufferedFileHandler(archivo, mode='w', encoding='utf-8')
+        archivo_handler.setFormatter(formatter)
+        
+        # Para el archivo los productores solo encolan registros; un hilo en
+        # segundo plano (QueueListener) se encarga de la escritura en disco
+        cola: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = QueueListener(cola, archivo_handler, respect_handler_level=True)
+        _listener.start()
+        
+        # Vaciar la cola al terminar el programa
+        atexit.register(_listener.stop)
+        
+        # El QueueHandler solo resuelve el mensaje antes de encolarlo; el
+        # formato completo lo aplica el handler del archivo
+        cola_handler = QueueHandler(cola)
+        cola_handler.setFormatter(logging.Formatter('%(message)s'))
+        handlers.append(cola_handler)
+    
+    # Configuración básica.
+    # force=True cierra y sustituye los handlers que ya tuviera el logger raíz
     logging.basicConfig(
+        force=True,
         level=nivel,
-        format=formato,
-        datefmt=formato_fecha,
         handlers=handlers
     )
+    
+    return logging.getLogger()
 
 
 # ==================== CREACIÓN DEL LOGGER ====================
@@ -53,9 +177,51 @@ def configurar_logging(nivel: int = logging.DEBUG, archivo: Optional[str] = None
 # Crear logger específico para este módulo
 logger = logging.getLogger(__name__)
 
+# Línea separadora de los banners (se construye una sola vez)
+_BANNER = "=" * 70
+
+# Hosts considerados locales en conectar_base_datos
+_LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1"})
+
+# Extensiones de archivo estándar en procesar_archivo
+_VALID_EXTS = (".txt", ".csv", ".json")
+
+# Categorías de edad de procesar_usuario: límites y textos de cada tramo
+_AGE_CUTS = (18, 65)
+_CATEGORIAS = ("menor", "adulto", "adulto_mayor")
+_MSGS = ("Usuario menor de edad", "Usuario adulto", "Usuario adulto mayor")
+
+# Patrón que simula un fallo de lectura en procesar_archivo
+_ERROR_RE = re.compile(r"error", re.IGNORECASE)
+
+# A partir de este tamaño compensa convertir la lista a un array de NumPy
+_MIN_ELEMENTOS_NUMPY = 10_000
+
 
 # ==================== FUNCIONES DE EJEMPLO ====================
 
+def _bind_fastlog(log: logging.Logger) -> Callable[..., None]:
+    """
+    Devuelve una función de log para ráfagas de mensajes DEBUG.
+    
+    El nivel se comprueba una sola vez, al crearla: si DEBUG está activo se
+    devuelve log._log con el nivel DEBUG ya fijado (sin pasar por isEnabledFor
+    en cada llamada); si no, una función que no hace nada.
+    
+    Importante: los cambios de nivel posteriores no se tienen en cuenta, así
+    que solo debe usarse en bloques cortos, dentro de una misma función.
+    
+    Args:
+        log: Logger a especializar
+        
+    Returns:
+        Callable: Función con la firma (mensaje, args)
+    """
+    if log.isEnabledFor(logging.DEBUG):
+        return functools.partial(log._log, logging.DEBUG)
+    return lambda msg, args: None
+
+
 def dividir(a: float, b: float) -> float:
     """
     Divide dos números con manejo de errores y logging completo.
@@ -70,18 +236,18 @@ def dividir(a: float, b: float) -> float:
     Raises:
         ZeroDivisionError: Si b es cero
     """
-    logger.debug(f"Iniciando división: {a} / {b}")
+    logger.debug("Iniciando división: %s / %s", a, b)
     
     if b == 0:
-        logger.error(f"Intento de división por cero: {a} / {b}")
+        logger.error("Intento de división por cero: %s / %s", a, b)
         raise ZeroDivisionError("No se puede dividir por cero")
     
     if abs(b) < 0.0001:
-        logger.warning(f"División por un número muy pequeño: {b}. Resultado puede ser impreciso")
+        logger.warning("División por un número muy pequeño: %s. Resultado puede ser impreciso", b)
     
     resultado = a / b
-    logger.info(f"División exitosa: {a} / {b} = {resultado}")
-    logger.debug(f"Tipo del resultado: {type(resultado)}")
+    logger.info("División exitosa: %s / %s = %s", a, b, resultado)
+    logger.debug("Tipo del resultado: %s", type(resultado))
     
     return resultado
 
@@ -97,38 +263,36 @@ def procesar_usuario(nombre: str, edad: int) -> dict:
     Returns:
         dict: Información procesada del usuario
     """
-    logger.debug(f"Iniciando procesamiento de usuario: nombre='{nombre}', edad={edad}")
-    
-    # Validar nombre
-    if not nombre or nombre.strip() == "":
+    # Validar nombre (se eliminan los espacios una sola vez) antes de cualquier
+    # otro log, para no hacer trabajo de más con entradas que se rechazan
+    nombre_limpio = nombre.strip() if nombre else ""
+    if not nombre_limpio:
         logger.error("Nombre vacío o inválido recibido")
         return {"error": "Nombre inválido"}
     
-    if len(nombre) < 2:
-        logger.warning(f"Nombre muy corto: '{nombre}' (longitud: {len(nombre)})")
+    logger.debug("Iniciando procesamiento de usuario: nombre='%s', edad=%s", nombre, edad)
+    
+    longitud = len(nombre_limpio)
+    if longitud < 2:
+        logger.warning("Nombre muy corto: '%s' (longitud: %d)", nombre_limpio, longitud)
     
     # Validar edad
     if edad < 0:
-        logger.error(f"Edad negativa recibida: {edad}")
+        logger.error("Edad negativa recibida: %s", edad)
         return {"error": "Edad inválida"}
     
-    if edad < 18:
-        logger.info(f"Usuario menor de edad: {nombre} ({edad} años)")
-        categoria = "menor"
-    elif edad < 65:
-        logger.info(f"Usuario adulto: {nombre} ({edad} años)")
-        categoria = "adulto"
-    else:
-        logger.info(f"Usuario adulto mayor: {nombre} ({edad} años)")
-        categoria = "adulto_mayor"
+    # Tramo de edad: 0 = menor, 1 = adulto, 2 = adulto mayor
+    idx = bisect.bisect_right(_AGE_CUTS, edad)
+    categoria = _CATEGORIAS[idx]
+    logger.info("%s: %s (%s años)", _MSGS[idx], nombre, edad)
     
     usuario = {
-        "nombre": nombre.strip(),
+        "nombre": nombre_limpio,
         "edad": edad,
         "categoria": categoria
     }
     
-    logger.debug(f"Usuario procesado correctamente: {usuario}")
+    logger.debug("Usuario procesado correctamente: %s", usuario)
     return usuario
 
 
@@ -144,23 +308,23 @@ def conectar_base_datos(host: str, puerto: int, timeout: int = 5) -> bool:
     Returns:
         bool: True si la conexión fue exitosa, False en caso contrario
     """
-    logger.debug(f"Intentando conectar a {host}:{puerto} (timeout: {timeout}s)")
+    logger.debug("Intentando conectar a %s:%s (timeout: %ss)", host, puerto, timeout)
     
     # Simular diferentes escenarios
     if puerto < 1 or puerto > 65535:
-        logger.critical(f"Puerto inválido: {puerto}. El sistema no puede continuar")
+        logger.critical("Puerto inválido: %s. El sistema no puede continuar", puerto)
         return False
     
-    if host == "localhost" or host == "127.0.0.1":
-        logger.info(f"Conectando a servidor local: {host}:{puerto}")
+    if host in _LOCAL_HOSTS:
+        logger.info("Conectando a servidor local: %s:%s", host, puerto)
         logger.debug("Conexión local establecida exitosamente")
         return True
     
     if timeout < 1:
-        logger.warning(f"Timeout muy bajo: {timeout}s. Puede causar fallos de conexión")
+        logger.warning("Timeout muy bajo: %ss. Puede causar fallos de conexión", timeout)
     
     if host.startswith("prod"):
-        logger.warning(f"Conectando a servidor de PRODUCCIÓN: {host}")
+        logger.warning("Conectando a servidor de PRODUCCIÓN: %s", host)
         logger.info("Conexión a producción establecida")
         return True
     
@@ -168,7 +332,7 @@ def conectar_base_datos(host: str, puerto: int, timeout: int = 5) -> bool:
         logger.error("Host vacío. No se puede establecer conexión")
         return False
     
-    logger.info(f"Conexión establecida a {host}:{puerto}")
+    logger.info("Conexión establecida a %s:%s", host, puerto)
     return True
 
 
@@ -182,33 +346,34 @@ def procesar_archivo(nombre_archivo: str) -> bool:
     Returns:
         bool: True si se procesó correctamente, False en caso contrario
     """
-    logger.debug(f"Iniciando procesamiento de archivo: {nombre_archivo}")
-    
+    # Comprobación barata antes de cualquier log
     if not nombre_archivo:
         logger.critical("Nombre de archivo NULL o vacío. Operación abortada")
         return False
     
-    if not nombre_archivo.endswith(('.txt', '.csv', '.json')):
-        logger.warning(f"Extensión de archivo no estándar: {nombre_archivo}")
+    logger.debug("Iniciando procesamiento de archivo: %s", nombre_archivo)
+    
+    if not nombre_archivo.endswith(_VALID_EXTS):
+        logger.warning("Extensión de archivo no estándar: %s", nombre_archivo)
     
     # Simular procesamiento
     try:
-        logger.info(f"Abriendo archivo: {nombre_archivo}")
-        logger.debug(f"Leyendo contenido de {nombre_archivo}")
+        logger.info("Abriendo archivo: %s", nombre_archivo)
+        logger.debug("Leyendo contenido de %s", nombre_archivo)
         
         # Simular error en algunos casos
-        if "error" in nombre_archivo.lower():
+        if _ERROR_RE.search(nombre_archivo) is not None:
             raise IOError(f"Error simulado al leer {nombre_archivo}")
         
-        logger.info(f"Archivo {nombre_archivo} procesado correctamente")
-        logger.debug(f"Cerrando archivo: {nombre_archivo}")
+        logger.info("Archivo %s procesado correctamente", nombre_archivo)
+        logger.debug("Cerrando archivo: %s", nombre_archivo)
         return True
         
     except IOError as e:
-        logger.error(f"Error de I/O al procesar archivo: {e}")
+        logger.error("Error de I/O al procesar archivo: %s", e)
         return False
     except Exception as e:
-        logger.critical(f"Error crítico inesperado: {e}", exc_info=True)
+        logger.critical("Error crítico inesperado: %s", e, exc_info=True)
         return False
 
 
@@ -222,26 +387,41 @@ def calcular_estadisticas(numeros: list[float]) -> dict:
     Returns:
         dict: Diccionario con estadísticas calculadas
     """
-    logger.debug(f"Calculando estadísticas para {len(numeros)} números")
+    logger.debug("Calculando estadísticas para %d números", len(numeros))
     
     if not numeros:
         logger.warning("Lista vacía recibida para calcular estadísticas")
         return {"error": "Lista vacía"}
     
     if len(numeros) < 5:
-        logger.warning(f"Muestra pequeña: solo {len(numeros)} elementos")
+        logger.warning("Muestra pequeña: solo %d elementos", len(numeros))
     
-    logger.debug(f"Números recibidos: {numeros}")
+    # Evita construir la representación de la lista si DEBUG está desactivado
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Números recibidos: %s", numeros)
     
     # Calcular estadísticas
-    promedio = sum(numeros) / len(numeros)
-    maximo = max(numeros)
-    minimo = min(numeros)
-    
-    logger.info(f"Estadísticas calculadas: promedio={promedio:.2f}, max={maximo}, min={minimo}")
+    if np is not None and len(numeros) >= _MIN_ELEMENTOS_NUMPY:
+        arr = np.asarray(numeros, dtype=np.float64)
+        promedio = float(arr.mean())
+        maximo = float(arr.max())
+        minimo = float(arr.min())
+    else:
+        # Una sola pasada en lugar de sum(), max() y min() por separado
+        suma = 0.0
+        minimo = maximo = numeros[0]
+        for x in numeros:
+            suma += x
+            if x < minimo:
+                minimo = x
+            elif x > maximo:
+                maximo = x
+        promedio = suma / len(numeros)
+    
+    logger.info("Estadísticas calculadas: promedio=%.2f, max=%s, min=%s", promedio, maximo, minimo)
     
     if maximo - minimo > 1000:
-        logger.warning(f"Gran dispersión en los datos: rango = {maximo - minimo}")
+        logger.warning("Gran dispersión en los datos: rango = %s", maximo - minimo)
     
     return {
         "promedio": promedio,
@@ -257,13 +437,17 @@ def demo_niveles_logging() -> None:
     """
     Demuestra el uso de todos los niveles de logging disponibles.
     """
-    logger.debug("=" * 70)
-    logger.debug("INICIO DE DEMOSTRACIÓN DE NIVELES DE LOGGING")
-    logger.debug("=" * 70)
+    # Se comprueba una sola vez si DEBUG está activo
+    fast_dbg = _bind_fastlog(logger)
+    
+    fast_dbg(_BANNER, ())
+    fast_dbg("INICIO DE DEMOSTRACIÓN DE NIVELES DE LOGGING", ())
+    fast_dbg(_BANNER, ())
     
     # DEBUG - Información muy detallada, típicamente de interés solo para diagnosticar problemas
-    logger.debug("Este es un mensaje DEBUG - información detallada para desarrolladores")
-    logger.debug(f"Variables del sistema: Python {sys.version_info.major}.{sys.version_info.minor}")
+    fast_dbg("Este es un mensaje DEBUG - información detallada para desarrolladores", ())
+    fast_dbg("Variables del sistema: Python %d.%d",
+             (sys.version_info.major, sys.version_info.minor))
     
     # INFO - Confirmación de que las cosas están funcionando como se esperaba
     logger.info("Este es un mensaje INFO - confirma que el programa funciona correctamente")
@@ -282,9 +466,9 @@ def demo_niveles_logging() -> None:
     logger.critical("Este es un mensaje CRITICAL - error grave que puede detener el programa")
     logger.critical("Sistema de archivos lleno, no se pueden guardar datos")
     
-    logger.debug("=" * 70)
-    logger.debug("FIN DE DEMOSTRACIÓN DE NIVELES DE LOGGING")
-    logger.debug("=" * 70)
+    fast_dbg(_BANNER, ())
+    fast_dbg("FIN DE DEMOSTRACIÓN DE NIVELES DE LOGGING", ())
+    fast_dbg(_BANNER, ())
 
 
 # ==================== PROGRAMA PRINCIPAL ====================
@@ -298,9 +482,16 @@ def main() -> None:
     configurar_logging(nivel=logging.DEBUG, archivo='app_ejemplo.log')
     #logging.disable(logging.CRITICAL)
 
-    logger.info("="*70)
-    logger.info("INICIO DEL PROGRAMA DE EJEMPLO DE LOGGING")
-    logger.info("="*70)
+    # Métodos y niveles activos que se usan en todo main
+    dbg = logger.debug
+    info = logger.info
+    debug_activo = logger.isEnabledFor(logging.DEBUG)
+    info_activo = logger.isEnabledFor(logging.INFO)
+
+    if info_activo:
+        info(_BANNER)
+        info("INICIO DEL PROGRAMA DE EJEMPLO DE LOGGING")
+        info(_BANNER)
     
     # 1. Demostración de todos los niveles
     print("\n--- DEMOSTRACIÓN DE NIVELES DE LOGGING ---")
@@ -317,73 +508,74 @@ def main() -> None:
         
         resultado3 = dividir(10, 0)  # Esto generará un error
     except ZeroDivisionError as e:
-        logger.error(f"Error capturado en main: {e}")
+        logger.error("Error capturado en main: %s", e)
     
     # 3. Ejemplo de procesamiento de usuarios
     print("\n--- EJEMPLO DE PROCESAMIENTO DE USUARIOS ---")
-    usuarios = [
+    # Tuplas de constantes: el compilador las crea una sola vez
+    usuarios = (
         ("Juan Pérez", 25),
         ("María García", 17),
         ("Pedro López", 70),
         ("", 30),  # Nombre inválido
         ("A", 15),  # Nombre muy corto
         ("Ana Torres", -5),  # Edad inválida
-    ]
+    )
     
     for nombre, edad in usuarios:
         resultado = procesar_usuario(nombre, edad)
-        logger.debug(f"Resultado procesamiento: {resultado}")
+        if debug_activo:
+            dbg("Resultado procesamiento: %r", resultado)
     
     # 4. Ejemplo de conexión a base de datos
     print("\n--- EJEMPLO DE CONEXIÓN A BASE DE DATOS ---")
-    servidores = [
-        ("localhost", 5432),
-        ("prod-server-01", 3306),
-        ("", 5432),  # Host vacío
-        ("dev-server", 999999),  # Puerto inválido
+    # (host, puerto, timeout): todas con el mismo formato para desempaquetar sin comprobar len()
+    servidores = (
+        ("localhost", 5432, 5),
+        ("prod-server-01", 3306, 5),
+        ("", 5432, 5),  # Host vacío
+        ("dev-server", 999999, 5),  # Puerto inválido
         ("backup-server", 8080, 1),  # Timeout bajo
-    ]
+    )
     
-    for config in servidores:
-        if len(config) == 2:
-            host, puerto = config
-            conectar_base_datos(host, puerto)
-        else:
-            host, puerto, timeout = config
-            conectar_base_datos(host, puerto, timeout)
+    for host, puerto, timeout in servidores:
+        conectar_base_datos(host, puerto, timeout)
     
     # 5. Ejemplo de procesamiento de archivos
     print("\n--- EJEMPLO DE PROCESAMIENTO DE ARCHIVOS ---")
-    archivos = [
+    archivos = (
         "datos.txt",
         "config.json",
         "reporte.csv",
         "documento.docx",  # Extensión no estándar
         "archivo_con_error.txt",  # Simulará error
         "",  # Archivo vacío
-    ]
+    )
     
     for archivo in archivos:
         procesar_archivo(archivo)
     
     # 6. Ejemplo de cálculo de estadísticas
     print("\n--- EJEMPLO DE CÁLCULO DE ESTADÍSTICAS ---")
-    conjuntos = [
+    # calcular_estadisticas recibe listas; solo el contenedor externo es una tupla
+    conjuntos = (
         [10.5, 20.3, 15.7, 30.2, 25.8],
         [1, 2, 3],  # Muestra pequeña
         [100, 1500, 200],  # Gran dispersión
         [],  # Lista vacía
-    ]
+    )
     
     for i, numeros in enumerate(conjuntos, 1):
-        logger.info(f"Procesando conjunto #{i}")
+        if info_activo:
+            info("Procesando conjunto #%d", i)
         stats = calcular_estadisticas(numeros)
         print(f"Estadísticas conjunto {i}: {stats}")
     
-    logger.info("="*70)
-    logger.info("FIN DEL PROGRAMA - Ejecución completada")
-    logger.info("="*70)
-    logger.info("Logs guardados en: app_ejemplo.log")
+    if info_activo:
+        info(_BANNER)
+        info("FIN DEL PROGRAMA - Ejecución completada")
+        info(_BANNER)
+        info("Logs guardados en: app_ejemplo.log")
 
 
 if __name__ == "__main__":
@@ -9,6 +9,26 @@ Autor: Eduardo Fdez
 Fecha: 2025-10-25
 """
 
+import sys
+from typing import Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él calcular_imc_batch usa listas
+    np = None
+
+# Numba (también opcional) se importa la primera vez que se llama a
+# calcular_imc_batch, para no ralentizar la importación del módulo.
+# Mientras tanto, prange es un range normal.
+prange = range
+
+
+# Categorías de IMC; el código numérico usado en calcular_imc_batch es el índice
+_IMC_LABELS = ("Bajo peso", "Normal", "Sobrepeso", "Obesidad")
+
+# Límites inferiores de "Normal", "Sobrepeso" y "Obesidad"
+_IMC_CUTS = (18.5, 25.0, 30.0)
+
 
 def calcular_imc(peso: float, altura: float) -> tuple[float, str]:
     """
@@ -30,56 +50,185 @@ def calcular_imc(peso: float, altura: float) -> tuple[float, str]:
         - Si peso < 20 o peso > 300, devolver (0.0, "Peso fuera de rango")
         - Si altura < 0.5 o altura > 2.5, devolver (0.0, "Altura fuera de rango")
     """
-    # TODO: Implementar la función
-    return (0.0, "")
+    if peso <= 0 or altura <= 0:
+        return (0.0, "Datos inválidos")
+    
+    if peso < 20 or peso > 300:
+        return (0.0, "Peso fuera de rango")
+    
+    if altura < 0.5 or altura > 2.5:
+        return (0.0, "Altura fuera de rango")
+    
+    imc: float = peso / (altura * altura)
+    
+    # Índice de categoría = número de límites superados (sin if/elif).
+    # int() es necesario: con floats de NumPy, bool + bool es un OR lógico
+    categoria: str = _IMC_LABELS[int(imc >= _IMC_CUTS[0]) + int(imc >= _IMC_CUTS[1]) + int(imc >= _IMC_CUTS[2])]
+    
+    return (imc, categoria)
 
 
-def solicitar_peso() -> float:
+def _imc_batch_kernel(pesos, alturas, imcs, categorias) -> None:
     """
-    Solicita el peso al usuario y valida que esté en rango.
+    Rellena imcs y categorias con el IMC y el código de categoría de cada par.
     
-    Returns:
-        float: Peso validado entre 20 y 300 kg
+    Si Numba está disponible se compila en paralelo (prange reparte el bucle
+    entre hilos); si no, se ejecuta como un bucle normal de Python.
+    """
+    for i in prange(len(pesos)):
+        peso = pesos[i]
+        altura = alturas[i]
+        
+        if peso < 20 or peso > 300 or altura < 0.5 or altura > 2.5:
+            imcs[i] = 0.0
+            categorias[i] = -1
+        else:
+            imc = peso / (altura * altura)
+            imcs[i] = imc
+            categorias[i] = int(imc >= _IMC_CUTS[0]) + int(imc >= _IMC_CUTS[1]) + int(imc >= _IMC_CUTS[2])
+
+
+# Versión del kernel que usa calcular_imc_batch (se decide en la primera llamada)
+_kernel_batch = None
+
+
+def _obtener_kernel_batch():
     """
-    peso: float = 0.0
+    Devuelve el kernel compilado con Numba si está disponible, o el de Python.
+    """
+    global _kernel_batch, prange
     
-    while peso < 20 or peso > 300:
-        entrada: str = input("Peso en kg: ")
+    if _kernel_batch is None:
+        _kernel_batch = _imc_batch_kernel
         
-        try:
-            peso = float(entrada)
-            
-            if peso < 20 or peso > 300:
-                print("Error: El peso debe estar entre 20 y 300 kg")
-        except ValueError:
-            print("Error: Debe introducir un número válido")
-            peso = 0.0
+        if np is not None:
+            try:
+                import numba
+            except ImportError:
+                pass
+            else:
+                prange = numba.prange
+                _kernel_batch = numba.njit(parallel=True, cache=True)(_imc_batch_kernel)
     
-    return peso
+    return _kernel_batch
 
 
-def solicitar_altura() -> float:
+def calcular_imc_batch(pesos, alturas) -> tuple:
     """
-    Solicita la altura al usuario y valida que esté en rango.
+    Calcula el IMC de muchas personas de una vez.
     
+    Args:
+        pesos: Secuencia de pesos en kilogramos
+        alturas: Secuencia de alturas en metros (misma longitud que pesos)
+        
     Returns:
-        float: Altura validada entre 0.5 y 2.5 metros
+        tuple: (imcs, categorias)
+            - imcs: IMC de cada persona (0.0 si los datos no son válidos)
+            - categorias: Código de categoría de cada persona:
+              0 = Bajo peso, 1 = Normal, 2 = Sobrepeso, 3 = Obesidad, -1 = Datos no válidos
+            Con NumPy son arrays (float64 e int8); sin NumPy son listas.
+        
+    Raises:
+        ValueError: Si pesos y alturas no tienen la misma longitud
+    """
+    n: int = len(pesos)
+    
+    if len(alturas) != n:
+        raise ValueError("pesos y alturas deben tener la misma longitud")
+    
+    if np is not None:
+        pesos = np.asarray(pesos, dtype=np.float64)
+        alturas = np.asarray(alturas, dtype=np.float64)
+        imcs = np.zeros(n, dtype=np.float64)
+        categorias = np.full(n, -1, dtype=np.int8)
+    else:
+        imcs = [0.0] * n
+        categorias = [-1] * n
+    
+    _obtener_kernel_batch()(pesos, alturas, imcs, categorias)
+    
+    return (imcs, categorias)
+
+
+def _solicitar(minimo: float, maximo: float, prompt: str, error_rango: str,
+               source: Optional[Iterator[str]] = None) -> float:
+    """
+    Lee valores hasta obtener un número dentro de [minimo, maximo].
+    
+    Si se recibe source, o la entrada estándar no es una terminal (por ejemplo,
+    datos redirigidos desde un archivo), las líneas se leen directamente del
+    iterador sin mostrar el prompt. En modo interactivo se muestra el prompt y
+    se lee una línea de sys.stdin.
+    
+    Args:
+        minimo: Valor mínimo aceptado
+        maximo: Valor máximo aceptado
+        prompt: Texto que se muestra al pedir el valor
+        error_rango: Mensaje si el valor está fuera de rango
+        source: Iterador de líneas de entrada (opcional); se consume a medida
+            que se lee, así que puede compartirse entre varias llamadas
+        
+    Returns:
+        float: Valor validado
+        
+    Raises:
+        EOFError: Si se acaba la entrada sin un valor válido
     """
-    altura: float = 0.0
+    lineas: Optional[Iterator[str]] = None
     
-    while altura < 0.5 or altura > 2.5:
-        entrada: str = input("Altura en metros: ")
+    if source is not None:
+        lineas = source
+    elif not sys.stdin.isatty():
+        lineas = iter(sys.stdin)
+    
+    while True:
+        if lineas is None:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            entrada: str = sys.stdin.readline()
+            if not entrada:
+                raise EOFError
+        else:
+            entrada = next(lineas, None)
+            if entrada is None:
+                raise EOFError
         
         try:
-            altura = float(entrada)
+            valor: float = float(entrada)
             
-            if altura < 0.5 or altura > 2.5:
-                print("Error: La altura debe estar entre 0.5 y 2.5 metros")
+            if minimo <= valor <= maximo:
+                return valor
+            print(error_rango)
         except ValueError:
             print("Error: Debe introducir un número válido")
-            altura = 0.0
+
+
+def solicitar_peso(source: Optional[Iterator[str]] = None) -> float:
+    """
+    Solicita el peso al usuario y valida que esté en rango.
+    
+    Args:
+        source: Iterador de líneas de entrada (opcional, útil para tests)
+    
+    Returns:
+        float: Peso validado entre 20 y 300 kg
+    """
+    return _solicitar(20, 300, "Peso en kg: ",
+                      "Error: El peso debe estar entre 20 y 300 kg", source)
+
+
+def solicitar_altura(source: Optional[Iterator[str]] = None) -> float:
+    """
+    Solicita la altura al usuario y valida que esté en rango.
+    
+    Args:
+        source: Iterador de líneas de entrada (opcional, útil para tests)
     
-    return altura
+    Returns:
+        float: Altura validada entre 0.5 y 2.5 metros
+    """
+    return _solicitar(0.5, 2.5, "Altura en metros: ",
+                      "Error: La altura debe estar entre 0.5 y 2.5 metros", source)
 
 
 def mostrar_resultado(peso: float, altura: float, imc: float, categoria: str) -> None:
@@ -7,8 +7,10 @@ Autor: Eduardo Fdez
 Fecha: 2025-10-25
 """
 
+import io
+
 import pytest
-from ejercicio04 import calcular_imc
+from ejercicio04 import calcular_imc, calcular_imc_batch, solicitar_altura, solicitar_peso
 
 
 class TestCalcularIMC:
@@ -122,6 +124,12 @@ class TestCalcularIMC:
         assert imc2 > 0
         assert cat2 != "Peso fuera de rango"
     
+    def test_valores_numpy(self):
+        """Test: Con floats de NumPy la categoría también es correcta"""
+        np = pytest.importorskip("numpy")
+        _, cat = calcular_imc(np.float64(95), np.float64(1.75))
+        assert cat == "Obesidad"
+    
     def test_limites_validos_altura(self):
         """Test: Límites exactos de altura (0.5 y 2.5) deben ser válidos"""
         imc1, cat1 = calcular_imc(70, 0.5)
@@ -147,5 +155,76 @@ def test_categorias_parametrizado(peso, altura, categoria_esperada):
     assert categoria == categoria_esperada
 
 
+class TestCalcularIMCBatch:
+    
+    def test_categorias(self):
+        """Test: Códigos de categoría 0-3 según el IMC"""
+        imcs, cats = calcular_imc_batch([50, 70, 80, 95], [1.75, 1.75, 1.75, 1.75])
+        assert list(cats) == [0, 1, 2, 3]
+        assert abs(imcs[1] - 22.86) < 0.01
+    
+    def test_coincide_con_calcular_imc(self):
+        """Test: El IMC de cada elemento coincide con calcular_imc"""
+        pesos = [45, 60, 80, 100, 50, 90]
+        alturas = [1.75, 1.75, 1.75, 1.75, 1.60, 1.80]
+        imcs, _ = calcular_imc_batch(pesos, alturas)
+        for peso, altura, imc in zip(pesos, alturas, imcs):
+            assert abs(imc - calcular_imc(peso, altura)[0]) < 1e-9
+    
+    def test_datos_no_validos(self):
+        """Test: Datos inválidos o fuera de rango dan IMC 0.0 y código -1"""
+        imcs, cats = calcular_imc_batch([0, 19, 301, 70, 70], [1.75, 1.75, 1.75, 0.49, 2.51])
+        assert list(imcs) == [0.0] * 5
+        assert list(cats) == [-1] * 5
+    
+    def test_longitudes_distintas(self):
+        """Test: Pesos y alturas de distinta longitud lanzan ValueError"""
+        with pytest.raises(ValueError):
+            calcular_imc_batch([70, 80], [1.75])
+    
+    def test_kernel_numba(self):
+        """Test: Con Numba instalado se usa el kernel compilado y devuelve arrays"""
+        pytest.importorskip("numba")
+        import ejercicio04
+        
+        imcs, cats = calcular_imc_batch([50, 70, 80, 95, 19], [1.75, 1.75, 1.75, 1.75, 1.75])
+        assert hasattr(ejercicio04._kernel_batch, "py_func")  # CPUDispatcher de Numba
+        assert cats.dtype.name == "int8"
+        assert list(cats) == [0, 1, 2, 3, -1]
+        assert abs(imcs[1] - 22.86) < 0.01
+        assert imcs[4] == 0.0
+
+
+class TestSolicitarDatos:
+    
+    def test_peso_desde_source(self):
+        """Test: Se descartan entradas inválidas hasta obtener un peso válido"""
+        assert solicitar_peso(iter(["abc\n", "10\n", "70.5\n"])) == 70.5
+    
+    def test_altura_desde_source(self):
+        """Test: Se descartan alturas fuera de rango"""
+        assert solicitar_altura(iter(["3\n", "1.75\n"])) == 1.75
+    
+    def test_source_agotado(self):
+        """Test: Si se acaba la entrada sin valor válido se lanza EOFError"""
+        with pytest.raises(EOFError):
+            solicitar_peso(iter(["500"]))
+    
+    def test_peso_y_altura_misma_source(self):
+        """Test: Peso y altura se leen seguidos de la misma entrada"""
+        lineas = iter(["70\n", "1.75\n"])
+        assert solicitar_peso(lineas) == 70.0
+        assert solicitar_altura(lineas) == 1.75
+    
+    def test_stdin_redirigido(self, monkeypatch, capsys):
+        """Test: Con stdin redirigido se leen sus líneas sin mostrar el prompt"""
+        monkeypatch.setattr("sys.stdin", io.StringIO("abc\n70\n1.75\n"))
+        assert solicitar_peso() == 70.0
+        assert solicitar_altura() == 1.75
+        salida = capsys.readouterr().out
+        assert "Peso en kg" not in salida
+        assert "Error: Debe introducir un número válido" in salida
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])